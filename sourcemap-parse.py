@@ -1,23 +1,124 @@
 # Accept URL from user pointing to a sourcemap file and download it temporary
 import argparse
+import collections
+import concurrent.futures
 import requests
-import tempfile
 import os
 import json
 import pathlib
 import shutil
 import logging
 import sys
-from bs4 import BeautifulSoup
+import lxml.html
 from urllib.parse import urljoin, urlparse
 import re
 import asyncio
 import aiohttp
 import urllib3
+import weakref
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import ijson
+except ImportError:  # Streaming extraction is optional, fall back to json.load
+    ijson = None
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is optional, the stdlib decoder accepts bytes too
+    from json import loads as _json_loads
 
 # Disable SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 River Security"
+)
+
+# Seconds to wait for a sourcemap download to connect or send more data
+SOURCEMAP_DOWNLOAD_TIMEOUT = 30
+
+# Number of leading bytes fetched when probing a URL for a sourcemap
+SOURCEMAP_PROBE_BYTES = 4096
+
+# Probe response statuses that mean the sourcemap does not exist
+SOURCEMAP_MISSING_STATUSES = (404, 410)
+
+# Object keys that identify a sourcemap within the probed prefix
+_SOURCEMAP_VERSION_KEY_RE = re.compile(rb'"version"\s*:')
+_SOURCEMAP_BODY_KEY_RE = re.compile(rb'"(?:mappings|sources)"\s*:')
+
+# Number of trailing bytes of a script searched for the sourceMappingURL comment
+SOURCEMAP_COMMENT_TAIL_BYTES = 4096
+
+# Bytes requested from the end of a script when looking for the comment, and
+# how much of the end is kept when a server ignores the Range header
+SCRIPT_TAIL_RANGE_BYTES = 8192
+SCRIPT_TAIL_BUFFER_BYTES = 256 * 1024
+
+# Matches the //# and /*# sourceMappingURL forms, including the legacy @ marker
+_SOURCEMAP_COMMENT_RE = re.compile(rb"(?://[#@]|/\*[#@])\s*sourceMappingURL=([^\s*]+)")
+
+# Windows-invalid path characters become underscores, control characters
+# are removed from each component of an extracted source path
+_PATH_PART_TRANSLATION = str.maketrans(
+    {**{char: "_" for char in '<>:"|?*\\'}, **{code: None for code in range(32)}}
+)
+
+# Maximum number of discovery requests (script tail fetches and sourcemap
+# probes) in flight at once, so fanning out every script of a page together
+# does not flood the target host. Also the connector's per-host connection
+# limit, so an admitted request never waits for a connection while its
+# timeout is already running
+SOURCEMAP_PROBE_CONCURRENCY = 32
+_PROBE_SEMAPHORES = weakref.WeakKeyDictionary()
+
+# Maximum number of source file batches being written concurrently during
+# extraction, and the number of files handed to a writer thread at once
+EXTRACT_WRITE_CONCURRENCY = 32
+EXTRACT_WRITE_BATCH_SIZE = 64
+
+# Number of writer threads used while extracting source files
+EXTRACT_WRITE_THREADS = min(32, (os.cpu_count() or 1) * 4)
+
+# Definitive probe outcomes of this run, URL to whether it is a sourcemap,
+# shared by the sync and async paths. Request errors and statuses other than
+# SOURCEMAP_MISSING_STATUSES are never recorded
+_SOURCEMAP_PROBE_RESULTS = {}
+
+# Async probes still in flight, URL to [task, number of callers awaiting it],
+# so concurrent checks of the same URL share one probe
+_PENDING_PROBES = {}
+
+
+def create_session():
+    """
+    Create the requests session shared by all synchronous HTTP calls.
+
+    Reusing one session keeps connections to the target alive across the
+    many same-origin probes instead of paying a TCP/TLS handshake per call.
+    """
+    session = requests.Session()
+    session.headers.update({"User-Agent": USER_AGENT})
+    # Retry transient connection failures briefly, HTTP errors are final.
+    # urllib3 would otherwise still honour Retry-After on 413/429/503, which
+    # lets a rate-limiting target stall every sequential probe
+    retries = Retry(
+        total=2,
+        backoff_factor=0.1,
+        status=0,
+        status_forcelist=(),
+        respect_retry_after_header=False,
+    )
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_SESSION = create_session()
+
 
 def is_same_domain(original_url, redirect_url):
     """
@@ -67,22 +168,16 @@ def get_script_tags(url, proxy=None):
         proxy (str, optional): Proxy URL (e.g., 'http://proxy:port' or 'socks5://proxy:port')
 
     Returns:
-        list: List of script tag dictionaries with 'src' and 'tag' keys
+        list: Absolute src URLs of the same-domain script tags
     """
     try:
-        # Make request to the webpage
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 River Security"
-        }
-
         # Configure proxy if provided
         proxies = None
         if proxy:
             proxies = {"http": proxy, "https": proxy}
 
-        response = requests.get(
-            url, headers=headers, timeout=10, proxies=proxies, verify=False
-        )
+        # Make request to the webpage
+        response = _SESSION.get(url, timeout=10, proxies=proxies, verify=False)
         response.raise_for_status()
 
         # Check if the final URL after redirects is on the same domain
@@ -92,30 +187,34 @@ def get_script_tags(url, proxy=None):
             )
             return []
 
-        # Parse HTML with BeautifulSoup
-        soup = BeautifulSoup(response.text, "html.parser")
+        if not response.content.strip():
+            logging.info("Empty response, no script tags to check")
+            return []
+
+        # Parse HTML with lxml, using the charset of the Content-Type header
+        # when there is one and otherwise letting lxml detect it from the bytes
+        parser = None
+        if "charset=" in response.headers.get("Content-Type", "").lower():
+            parser = lxml.html.HTMLParser(encoding=response.encoding)
+        document = lxml.html.fromstring(response.content, parser=parser)
 
         # Find the head element
-        head = soup.find("head")
-        if not head:
+        if document.find(".//head") is None:
             logging.info("No <head> element found")
 
-        # After checking <head>, also check the rest of the document for <script> tags
-        # that are not in <head> (e.g., in <body> or elsewhere).
-        # We'll collect all <script> tags from the document, then filter out those already in head.
-        all_script_tags = soup.find_all("script")
+        # Collect the src of every <script> tag in the document, in <head>,
+        # <body> or elsewhere
+        script_srcs = document.xpath("//script/@src")
 
+        page_netloc = urlparse(url).netloc
         scripts = []
-        for script in all_script_tags:
-            src = script.get("src")
+        for src in script_srcs:
             if src:
                 # Convert relative URLs to absolute URLs
                 if not src.startswith(("http://", "https://")):
                     src = urljoin(url, src)
-                parsed_url = urlparse(url)
-                parsed_src = urlparse(src)
-                if parsed_url.netloc == parsed_src.netloc:
-                    scripts.append({"src": src, "tag": str(script)})
+                if urlparse(src).netloc == page_netloc:
+                    scripts.append(src)
                 else:
                     logging.info(f"Skipping script from different domain: {src}")
 
@@ -137,9 +236,44 @@ def setup_logging(log_level):
     )
 
 
+def create_client_session():
+    """
+    Create the aiohttp session used for async sourcemap discovery.
+
+    Must be called from inside a running event loop.
+    """
+    # Create SSL context that doesn't verify certificates
+    import ssl
+
+    ssl_context = ssl.create_default_context()
+    ssl_context.check_hostname = False
+    ssl_context.verify_mode = ssl.CERT_NONE
+
+    # One pooled connector shared by every probe: discovery hits a single
+    # origin, so its keep-alive connections are reused across the probe waves
+    # instead of paying a new TLS handshake per request
+    connector = aiohttp.TCPConnector(
+        ssl=ssl_context,
+        limit=256,
+        limit_per_host=SOURCEMAP_PROBE_CONCURRENCY,
+        ttl_dns_cache=300,
+        keepalive_timeout=75,
+    )
+    return aiohttp.ClientSession(
+        connector=connector, headers={"User-Agent": USER_AGENT}
+    )
+
+
 async def check_for_sourcemaps(script_urls, proxy=None):
     """
     Async version of check_for_sourcemaps that processes URLs concurrently.
+
+    Args:
+        script_urls (list): Script URLs to check for sourcemaps
+        proxy (str, optional): Proxy URL (e.g., 'http://proxy:port' or 'socks5://proxy:port')
+
+    Returns:
+        dict: Script URL to list of found sourcemap dictionaries
     """
     results = {}
 
@@ -150,35 +284,46 @@ async def check_for_sourcemaps(script_urls, proxy=None):
         )
         return check_for_sourcemaps_sync(script_urls, proxy)
 
-    # Create SSL context that doesn't verify certificates
-    import ssl
-
-    ssl_context = ssl.create_default_context()
-    ssl_context.check_hostname = False
-    ssl_context.verify_mode = ssl.CERT_NONE
+    # One session for the whole page, so every script's requests share the
+    # pooled connections
+    async with create_client_session() as session:
+        # Submit every script at once, the individual requests are bounded by
+        # the shared probe semaphore and the connector limits. gather() rather
+        # than a TaskGroup so one failing script is reported without
+        # cancelling the others
+        completed_tasks = await asyncio.gather(
+            *(
+                check_single_script_async(session, script_url, proxy)
+                for script_url in script_urls
+            ),
+            return_exceptions=True,
+        )
 
-    # Create connector with SSL context
-    connector = aiohttp.TCPConnector(ssl=ssl_context)
+    # Process results
+    for script_url, result in zip(script_urls, completed_tasks):
+        if isinstance(result, Exception):
+            logging.error(f"Error processing {script_url}: {result}")
+            results[script_url] = []
+        else:
+            results[script_url] = result
 
-    async with aiohttp.ClientSession(connector=connector) as session:
-        # Create tasks for all script URLs
-        tasks = [
-            check_single_script_async(session, script_url, proxy)
-            for script_url in script_urls
-        ]
+    return results
 
-        # Execute all tasks concurrently
-        completed_tasks = await asyncio.gather(*tasks, return_exceptions=True)
 
-        # Process results
-        for script_url, result in zip(script_urls, completed_tasks):
-            if isinstance(result, Exception):
-                logging.error(f"Error processing {script_url}: {result}")
-                results[script_url] = []
-            else:
-                results[script_url] = result
+def add_pattern_sourcemaps(sourcemaps, pattern_urls):
+    """
+    Append sourcemaps found by URL pattern, skipping URLs already listed.
 
-    return results
+    Args:
+        sourcemaps (list): Sourcemap dictionaries found so far, updated in place
+        pattern_urls (list): Sourcemap URLs found through common patterns
+    """
+    seen_urls = {s["url"] for s in sourcemaps}
+    for sourcemap_url in pattern_urls:
+        if sourcemap_url in seen_urls:  # Avoid duplicates
+            continue
+        seen_urls.add(sourcemap_url)
+        sourcemaps.append({"url": sourcemap_url, "method": "pattern"})
 
 
 def check_for_sourcemaps_sync(script_urls, proxy=None):
@@ -196,39 +341,72 @@ def check_for_sourcemaps_sync(script_urls, proxy=None):
         logging.info(f"Checking: {script_url}")
         sourcemaps = []
 
-        # Method 1: Check for source map comment in script content
+        # Method 1: Check for a sourcemap header, then for a source map
+        # comment in script content
         try:
-            response = requests.get(
-                script_url, timeout=10, proxies=proxies, verify=False
-            )
-            if response.status_code == 200:
-                # Check if the final URL after redirects is on the same domain
-                if not is_same_domain(script_url, response.url):
-                    logging.warning(
-                        f"Redirect from {script_url} to {response.url} goes off-domain, skipping source map processing"
+            # A HEAD request reveals a SourceMap header without the body
+            sourcemap_header = None
+            try:
+                response = _SESSION.head(
+                    script_url,
+                    timeout=10,
+                    proxies=proxies,
+                    verify=False,
+                    allow_redirects=True,
+                )
+                if response.status_code == 200:
+                    if not is_same_domain(script_url, response.url):
+                        logging.warning(
+                            f"Redirect from {script_url} to {response.url} goes off-domain, skipping source map processing"
+                        )
+                        results[script_url] = []
+                        continue
+                    sourcemap_header = find_sourcemap_header(response.headers)
+            except requests.RequestException as e:
+                logging.debug(f"  HEAD request failed for {script_url}: {e}")
+
+            if sourcemap_header:
+                sourcemap_url = urljoin(script_url, sourcemap_header)
+                if check_url_exists(sourcemap_url, proxy):
+                    sourcemaps.append(
+                        {
+                            "url": sourcemap_url,
+                            "method": "header",
+                            "header": sourcemap_header,
+                        }
                     )
-                    results[script_url] = []
-                    continue
-                # Look for source map comment
-                sourcemap_comment = find_sourcemap_comment(response.text)
-                if sourcemap_comment:
-                    sourcemap_url = urljoin(script_url, sourcemap_comment)
-                    if check_url_exists(sourcemap_url, proxy):
-                        sourcemaps.append(
-                            {
-                                "url": sourcemap_url,
-                                "method": "comment",
-                                "comment": sourcemap_comment,
-                            }
+
+            # Only download the script when no header pointed to a sourcemap
+            if not sourcemaps:
+                response = _SESSION.get(
+                    script_url, timeout=10, proxies=proxies, verify=False
+                )
+                if response.status_code == 200:
+                    # Check if the final URL after redirects is on the same domain
+                    if not is_same_domain(script_url, response.url):
+                        logging.warning(
+                            f"Redirect from {script_url} to {response.url} goes off-domain, skipping source map processing"
                         )
+                        results[script_url] = []
+                        continue
+                    # Look for source map comment
+                    sourcemap_comment = find_sourcemap_comment(response.content)
+                    if sourcemap_comment:
+                        sourcemap_url = urljoin(script_url, sourcemap_comment)
+                        if check_url_exists(sourcemap_url, proxy):
+                            sourcemaps.append(
+                                {
+                                    "url": sourcemap_url,
+                                    "method": "comment",
+                                    "comment": sourcemap_comment,
+                                }
+                            )
         except Exception as e:
             logging.error(f"  Error checking script content: {e}")
 
         # Method 2: Try common source map URL patterns
         common_sourcemaps = check_common_sourcemap_patterns(script_url, proxy)
-        for sourcemap in common_sourcemaps:
-            if sourcemap not in [s["url"] for s in sourcemaps]:  # Avoid duplicates
-                sourcemaps.append({"url": sourcemap, "method": "pattern"})
+        add_pattern_sourcemaps(sourcemaps, common_sourcemaps)
 
         results[script_url] = sourcemaps
 
@@ -238,59 +416,142 @@ def check_for_sourcemaps_sync(script_urls, proxy=None):
 async def check_single_script_async(session, script_url, proxy=None):
     """
     Async version of checking a single script for sourcemaps.
+
+    The comment check and the pattern probes are independent requests, so
+    both run concurrently.
     """
     logging.info(f"Checking: {script_url}")
-    sourcemaps = []
 
     # Method 1: Check for source map comment in script content
+    comment_task = asyncio.create_task(
+        check_sourcemap_comment_async(session, script_url, proxy)
+    )
+    # Method 2: Try common source map URL patterns
+    patterns_task = asyncio.create_task(
+        check_common_sourcemap_patterns_async(session, script_url, proxy)
+    )
+
+    try:
+        sourcemaps = await comment_task
+        if sourcemaps is None:
+            # The script redirected off-domain, drop the pattern results too
+            return []
+        common_sourcemaps = await patterns_task
+    finally:
+        patterns_task.cancel()
+
+    add_pattern_sourcemaps(sourcemaps, common_sourcemaps)
+
+    return sourcemaps
+
+
+async def check_sourcemap_comment_async(session, script_url, proxy=None):
+    """
+    Look for a SourceMap header or sourceMappingURL comment in a script and
+    validate its target. The script body is only fetched without a header.
+
+    Returns:
+        list or None: Sourcemap dictionaries found through the header or the
+        comment, or None when the script redirects off-domain
+    """
+    sourcemaps = []
+
     try:
         # Configure proxy for this request if provided
         request_kwargs = {"timeout": aiohttp.ClientTimeout(total=10)}
         if proxy:
             request_kwargs["proxy"] = proxy
 
-        async with session.get(script_url, **request_kwargs) as response:
-            if response.status == 200:
-                # Check if the final URL after redirects is on the same domain
-                if not is_same_domain(script_url, str(response.url)):
-                    logging.warning(
-                        f"Redirect from {script_url} to {response.url} goes off-domain, skipping source map processing"
-                    )
-                    return []
-                content = await response.text()
-                sourcemap_comment = find_sourcemap_comment(content)
-                if sourcemap_comment:
-                    sourcemap_url = urljoin(script_url, sourcemap_comment)
-                    if await check_if_exists_and_is_map(session, sourcemap_url, proxy):
-                        sourcemaps.append(
-                            {
-                                "url": sourcemap_url,
-                                "method": "comment",
-                                "comment": sourcemap_comment,
-                            }
+        # Servers may announce the sourcemap in a header, which a HEAD request
+        # reveals without downloading any of the script
+        sourcemap_header = None
+        try:
+            async with _probe_semaphore():
+                async with session.head(
+                    script_url, allow_redirects=True, **request_kwargs
+                ) as response:
+                    if response.status == 200:
+                        if not is_same_domain(script_url, str(response.url)):
+                            logging.warning(
+                                f"Redirect from {script_url} to {response.url} goes off-domain, skipping source map processing"
+                            )
+                            return None
+                        sourcemap_header = find_sourcemap_header(response.headers)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logging.debug(f"  HEAD request failed for {script_url}: {e}")
+
+        if sourcemap_header:
+            sourcemap_url = urljoin(script_url, sourcemap_header)
+            if await check_if_exists_and_is_map(session, sourcemap_url, proxy):
+                return [
+                    {
+                        "url": sourcemap_url,
+                        "method": "header",
+                        "header": sourcemap_header,
+                    }
+                ]
+
+        # The comment lives at the end of the script, so ask for the tail only.
+        # Ranges apply to the encoded body, hence no compression for this one.
+        # Unlike the sync path, which scans the whole script, a comment
+        # followed by more than the fetched tail (SCRIPT_TAIL_RANGE_BYTES, or
+        # SCRIPT_TAIL_BUFFER_BYTES without Range support) is missed here; the
+        # pattern probes still cover the usual map locations
+        headers = {
+            "Range": f"bytes=-{SCRIPT_TAIL_RANGE_BYTES}",
+            "Accept-Encoding": "identity",
+        }
+        # The tail fetch shares the probe bound, so every script's requests
+        # can be submitted at once without flooding the target host
+        sourcemap_comment = None
+        async with _probe_semaphore():
+            async with session.get(
+                script_url, headers=headers, **request_kwargs
+            ) as response:
+                if response.status in (200, 206):
+                    # Check if the final URL after redirects is on the same domain
+                    if not is_same_domain(script_url, str(response.url)):
+                        logging.warning(
+                            f"Redirect from {script_url} to {response.url} goes off-domain, skipping source map processing"
                         )
+                        return None
+                    # Servers ignoring Range send the whole bundle, only keep its end
+                    content = await read_response_tail(
+                        response, SCRIPT_TAIL_BUFFER_BYTES
+                    )
+                    sourcemap_comment = find_sourcemap_comment(content)
+
+        if sourcemap_comment:
+            sourcemap_url = urljoin(script_url, sourcemap_comment)
+            if await check_if_exists_and_is_map(session, sourcemap_url, proxy):
+                sourcemaps.append(
+                    {
+                        "url": sourcemap_url,
+                        "method": "comment",
+                        "comment": sourcemap_comment,
+                    }
+                )
     except Exception as e:
         logging.error(f"  Error checking script content: {e}")
 
-    # Method 2: Try common source map URL patterns
-    common_sourcemaps = await check_common_sourcemap_patterns_async(
-        session, script_url, proxy
-    )
-    for sourcemap in common_sourcemaps:
-        if sourcemap not in [s["url"] for s in sourcemaps]:
-            sourcemaps.append({"url": sourcemap, "method": "pattern"})
-
     return sourcemaps
 
 
-async def check_common_sourcemap_patterns_async(session, script_url, proxy=None):
+def sourcemap_candidate_urls(script_url):
     """
-    Async version of checking common sourcemap patterns.
+    Build the common sourcemap URLs to probe for a script.
+
+    Args:
+        script_url (str): The script URL
+
+    Returns:
+        list: Unique candidate URLs in preference order
     """
     parsed_url = urlparse(script_url)
     path = parsed_url.path
     base_path = path.rsplit(".", 1)[0] if "." in path else path
 
+    # Common source map patterns
     patterns = [
         f"{base_path}.map",
         f"{base_path}.js.map",
@@ -300,77 +561,240 @@ async def check_common_sourcemap_patterns_async(session, script_url, proxy=None)
         f"{path}.css.map",
     ]
 
-    accessible_sourcemaps = []
-    for pattern in patterns:
-        sourcemap_url = f"{parsed_url.scheme}://{parsed_url.netloc}{pattern}"
-        if await check_if_exists_and_is_map(session, sourcemap_url, proxy):
-            accessible_sourcemaps.append(sourcemap_url)
+    # dict.fromkeys drops the duplicates produced when base_path == path
+    # while keeping the preference order
+    candidate_urls = dict.fromkeys(
+        f"{parsed_url.scheme}://{parsed_url.netloc}{pattern}" for pattern in patterns
+    )
+    # A script that is itself a .map URL would otherwise probe itself
+    candidate_urls.pop(script_url, None)
+    return list(candidate_urls)
+
+
+async def check_common_sourcemap_patterns_async(session, script_url, proxy=None):
+    """
+    Async version of checking common sourcemap patterns.
+
+    Candidates are probed concurrently and the first sourcemap in preference
+    order is returned, cancelling the probes of less preferred candidates.
+    """
+    candidate_urls = sourcemap_candidate_urls(script_url)
+
+    tasks = [
+        asyncio.ensure_future(check_if_exists_and_is_map(session, url, proxy))
+        for url in candidate_urls
+    ]
+    try:
+        for sourcemap_url, task in zip(candidate_urls, tasks):
+            if await task:
+                return [sourcemap_url]
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    return []
+
+
+async def read_response_tail(response, size):
+    """Stream an aiohttp response body, keeping only roughly its last size bytes"""
+    chunks = collections.deque()
+    kept = 0
+    async for chunk in response.content.iter_chunked(65536):
+        chunks.append(chunk)
+        kept += len(chunk)
+        # Drop leading chunks that are no longer needed to cover size bytes
+        while kept - len(chunks[0]) >= size:
+            kept -= len(chunks.popleft())
+    return b"".join(chunks)
+
+
+def _probe_semaphore():
+    """Return the semaphore bounding sourcemap probes on the running loop"""
+    loop = asyncio.get_running_loop()
+    semaphore = _PROBE_SEMAPHORES.get(loop)
+    if semaphore is None:
+        semaphore = _PROBE_SEMAPHORES[loop] = asyncio.Semaphore(
+            SOURCEMAP_PROBE_CONCURRENCY
+        )
+    return semaphore
+
 
-    return accessible_sourcemaps
+async def read_response_prefix(response, size):
+    """Read at most size bytes from the start of an aiohttp response body"""
+    prefix = b""
+    while len(prefix) < size:
+        chunk = await response.content.read(size - len(prefix))
+        if not chunk:
+            break
+        prefix += chunk
+    return prefix
+
+
+def is_sourcemap_prefix(prefix):
+    """
+    Check whether the first bytes of a document look like a sourcemap.
+
+    Args:
+        prefix (bytes): Leading bytes of the candidate document
+
+    Returns:
+        bool: True if the prefix carries the sourcemap signature
+    """
+    # A sourcemap is a JSON object. Maps behind the )]}' XSSI guard are not
+    # accepted, as neither download path strips the guard before parsing
+    if not prefix.lstrip().startswith(b"{"):
+        return False
+    # Generators disagree on key order (rollup puts "mappings" last), so
+    # accept either of the keys that follow "version" in practice
+    return bool(
+        _SOURCEMAP_VERSION_KEY_RE.search(prefix)
+        and _SOURCEMAP_BODY_KEY_RE.search(prefix)
+    )
 
 
 async def check_if_exists_and_is_map(session, url, proxy=None):
     """
     Async version of checking if a URL exists and is a valid sourcemap.
+
+    Probes with HEAD first and then only fetches the first few KB of the
+    body to look for the sourcemap signature, the document is never
+    parsed here.
     """
+    # Scripts sharing a base path produce the same candidates, and a comment
+    # or header target may be a candidate too, so each URL is probed once
+    if url in _SOURCEMAP_PROBE_RESULTS:
+        return _SOURCEMAP_PROBE_RESULTS[url]
+
+    # All scripts are checked at once, so join a probe already in flight
+    pending = _PENDING_PROBES.get(url)
+    if pending is None:
+        pending = _PENDING_PROBES[url] = [
+            asyncio.ensure_future(_record_probe_async(session, url, proxy)),
+            0,
+        ]
+    pending[1] += 1
     try:
-        # Configure proxy for this request if provided
-        request_kwargs = {"timeout": aiohttp.ClientTimeout(total=5)}
-        if proxy:
-            request_kwargs["proxy"] = proxy
+        # Shielded so one caller giving up does not cancel it for the others
+        return await asyncio.shield(pending[0])
+    finally:
+        pending[1] -= 1
+        if not pending[1]:
+            # Nobody is waiting anymore, drop the probe if still running
+            pending[0].cancel()
+            if _PENDING_PROBES.get(url) is pending:
+                del _PENDING_PROBES[url]
+
+
+async def _record_probe_async(session, url, proxy=None):
+    """Probe url and remember the outcome unless the request failed"""
+    async with _probe_semaphore():
+        try:
+            is_map = await _probe_sourcemap_async(session, url, proxy)
+        except Exception as e:
+            # Timeouts and connection errors may be transient, so they are
+            # not remembered as misses
+            logging.debug(f"Not a source map: {url}: {e}")
+            return False
 
-        async with session.get(url, **request_kwargs) as response:
-            if response.status == 200:
-                # Check if the final URL after redirects is on the same domain
-                if not is_same_domain(url, str(response.url)):
-                    logging.warning(
-                        f"Redirect from {url} to {response.url} goes off-domain, skipping source map processing"
-                    )
-                    return False
-                # Force JSON processing by reading as text first
-                try:
-                    text_content = await response.text()
-                    data = json.loads(text_content)
-                    return (
-                        isinstance(data, dict)
-                        and "version" in data
-                        and "file" in data
-                        and "mappings" in data
-                    )
-                except json.JSONDecodeError as json_error:
-                    logging.debug(f"Failed to parse JSON from {url}: {json_error}")
-                    return False
-        return False
-    except Exception as e:
-        logging.debug(f"Not a source map: {url}: {e}")
+    _SOURCEMAP_PROBE_RESULTS[url] = is_map
+    return is_map
+
+
+def _probe_status_ok(url, status, ok_statuses):
+    """
+    Decide whether a probe can go on after a response with the given status.
+
+    Returns:
+        bool: True for one of ok_statuses, False when the URL is definitely
+        missing
+
+    Raises:
+        Exception: For any other status, e.g. 429 or 503, which may be
+        transient and must not be remembered as a miss
+    """
+    if status in ok_statuses:
+        return True
+    if status in SOURCEMAP_MISSING_STATUSES:
         return False
+    raise Exception(f"Unexpected HTTP status {status} for {url}")
+
+
+async def _probe_sourcemap_async(session, url, proxy=None):
+    """Probe url for a sourcemap, raising on request errors"""
+    # Configure proxy for this request if provided
+    request_kwargs = {"timeout": aiohttp.ClientTimeout(total=5)}
+    if proxy:
+        request_kwargs["proxy"] = proxy
+
+    async with session.head(url, allow_redirects=True, **request_kwargs) as response:
+        # Some servers refuse HEAD, let the ranged GET decide for those
+        if not _probe_status_ok(url, response.status, (200, 405, 501)):
+            return False
+        # Check if the final URL after redirects is on the same domain
+        if not is_same_domain(url, str(response.url)):
+            logging.warning(
+                f"Redirect from {url} to {response.url} goes off-domain, skipping source map processing"
+            )
+            return False
+
+    headers = {"Range": f"bytes=0-{SOURCEMAP_PROBE_BYTES - 1}"}
+    async with session.get(url, headers=headers, **request_kwargs) as response:
+        if not _probe_status_ok(url, response.status, (200, 206)):
+            return False
+        # Check if the final URL after redirects is on the same domain
+        if not is_same_domain(url, str(response.url)):
+            logging.warning(
+                f"Redirect from {url} to {response.url} goes off-domain, skipping source map processing"
+            )
+            return False
+        # Never read past the prefix, even if the server ignored Range
+        prefix = await read_response_prefix(response, SOURCEMAP_PROBE_BYTES)
+
+    return is_sourcemap_prefix(prefix)
 
 
 def find_sourcemap_comment(script_content):
     """
     Find source map comment in script content.
 
+    The tail of the script is scanned first, as the comment is normally
+    emitted at the end of the generated file. The rest of the script is only
+    searched when the tail has no match.
+
     Args:
-        script_content (str): The script content to search
+        script_content (bytes or str): The script content to search
 
     Returns:
         str or None: Source map URL from comment if found
     """
-    patterns = [
-        r"//# sourceMappingURL=([^\s]+)",
-        r"//@ sourceMappingURL=([^\s]+)",
-        r"/\*# sourceMappingURL=([^\s]+) \*/",
-        r"/\*@ sourceMappingURL=([^\s]+) @\*/",
-    ]
+    if isinstance(script_content, str):
+        script_content = script_content.encode("utf-8", "ignore")
 
-    for pattern in patterns:
-        match = re.search(pattern, script_content)
-        if match:
-            return match.group(1)
+    match = _SOURCEMAP_COMMENT_RE.search(
+        script_content, max(0, len(script_content) - SOURCEMAP_COMMENT_TAIL_BYTES)
+    )
+    if match is None and len(script_content) > SOURCEMAP_COMMENT_TAIL_BYTES:
+        # e.g. a license banner or large inline data appended after the comment
+        match = _SOURCEMAP_COMMENT_RE.search(script_content)
+    if match:
+        return match.group(1).decode("utf-8", "ignore")
 
     return None
 
 
+def find_sourcemap_header(headers):
+    """
+    Find the sourcemap URL announced in a script's response headers.
+
+    Args:
+        headers: Case-insensitive response headers of the script
+
+    Returns:
+        str or None: Value of the SourceMap or legacy X-SourceMap header
+    """
+    return headers.get("SourceMap") or headers.get("X-SourceMap")
+
+
 def check_common_sourcemap_patterns(script_url, proxy=None):
     """
     Check common source map URL patterns for a script.
@@ -380,34 +804,21 @@ def check_common_sourcemap_patterns(script_url, proxy=None):
         proxy (str, optional): Proxy URL (e.g., 'http://proxy:port' or 'socks5://proxy:port')
 
     Returns:
-        list: List of accessible source map URLs
+        list: The first accessible source map URL in preference order, if any
     """
-    parsed_url = urlparse(script_url)
-    path = parsed_url.path
-    base_path = path.rsplit(".", 1)[0] if "." in path else path
-
-    # Common source map patterns
-    patterns = [
-        f"{base_path}.map",
-        f"{base_path}.js.map",
-        f"{base_path}.css.map",
-        f"{path}.map",
-        f"{path}.js.map",
-        f"{path}.css.map",
-    ]
-
-    accessible_sourcemaps = []
-    for pattern in patterns:
-        sourcemap_url = f"{parsed_url.scheme}://{parsed_url.netloc}{pattern}"
+    for sourcemap_url in sourcemap_candidate_urls(script_url):
         if check_url_exists(sourcemap_url, proxy):
-            accessible_sourcemaps.append(sourcemap_url)
+            return [sourcemap_url]
 
-    return accessible_sourcemaps
+    return []
 
 
 def check_url_exists(url, proxy=None):
     """
-    Check if a URL exists by making a GET request and validating it's a source map.
+    Check if a URL exists and looks like a source map.
+
+    Probes with HEAD first and then only fetches the first few KB of the body
+    to look for the sourcemap signature.
 
     Args:
         url (str): URL to check
@@ -416,45 +827,85 @@ def check_url_exists(url, proxy=None):
     Returns:
         bool: True if URL exists and is a valid source map
     """
+    # Shares the probe results of check_if_exists_and_is_map
+    if url in _SOURCEMAP_PROBE_RESULTS:
+        return _SOURCEMAP_PROBE_RESULTS[url]
+
     try:
-        # Configure proxy if provided
-        proxies = None
-        if proxy:
-            proxies = {"http": proxy, "https": proxy}
+        is_map = _probe_sourcemap(url, proxy)
+    except Exception as e:
+        # Timeouts and connection errors may be transient, so they are not
+        # remembered
+        logging.info(f"Not a source map: {url}: {e}")
+        return False
+
+    _SOURCEMAP_PROBE_RESULTS[url] = is_map
+    return is_map
+
 
-        response = requests.get(url, timeout=5, proxies=proxies, verify=False)
+def _probe_sourcemap(url, proxy=None):
+    """Probe url for a sourcemap, raising on request errors"""
+    # Configure proxy if provided
+    proxies = None
+    if proxy:
+        proxies = {"http": proxy, "https": proxy}
+
+    response = _SESSION.head(
+        url, timeout=5, proxies=proxies, verify=False, allow_redirects=True
+    )
+    # Some servers refuse HEAD, let the ranged GET decide for those
+    if not _probe_status_ok(url, response.status_code, (200, 405, 501)):
+        return False
+    # Check if the final URL after redirects is on the same domain
+    if not is_same_domain(url, response.url):
+        logging.warning(
+            f"Redirect from {url} to {response.url} goes off-domain, skipping source map processing"
+        )
+        return False
+
+    headers = {"Range": f"bytes=0-{SOURCEMAP_PROBE_BYTES - 1}"}
+    with _SESSION.get(
+        url,
+        headers=headers,
+        timeout=5,
+        proxies=proxies,
+        verify=False,
+        stream=True,
+    ) as response:
+        if not _probe_status_ok(url, response.status_code, (200, 206)):
+            return False
         # Check if the final URL after redirects is on the same domain
         if not is_same_domain(url, response.url):
             logging.warning(
                 f"Redirect from {url} to {response.url} goes off-domain, skipping source map processing"
             )
             return False
-        data = response.json()
-        if not (
-            isinstance(data, dict)
-            and "version" in data
-            and "file" in data
-            and "mappings" in data
-        ):
-            return False
-        return True
-    except Exception as e:
-        logging.info(f"Not a source map: {url}: {e}")
-        return False
+        # Never read past the prefix, even if the server ignored Range
+        prefix = response.raw.read(SOURCEMAP_PROBE_BYTES, decode_content=True)
 
+    return is_sourcemap_prefix(prefix)
 
-def check_and_clean_output_directory(output_dir):
-    """Check if output directory is empty, ask user for confirmation if not"""
+
+def check_and_clean_output_directory(output_dir, force=False):
+    """
+    Check if output directory is empty, ask user for confirmation if not.
+
+    With force=True the directory is cleaned without prompting, so batch runs
+    never block on input().
+    """
     output_path = pathlib.Path(output_dir)
 
     # Check if directory exists and has contents
     if output_path.exists() and any(output_path.iterdir()):
         print(f"\nWarning: The output directory '{output_dir}' is not empty.")
-        response = (
-            input("Do you want to continue and delete existing contents? (y/N): ")
-            .strip()
-            .lower()
-        )
+        if force:
+            response = "yes"
+        else:
+            response = (
+                input("Do you want to continue and delete existing contents? (y/N): ")
+                .strip()
+                .lower()
+            )
 
         if response in ["y", "yes"]:
             print(f"Cleaning directory '{output_dir}'...")
@@ -475,31 +926,113 @@ def check_and_clean_output_directory(output_dir):
 
 def download_sourcemap(url):
     """Download sourcemap from URL and return as JSON"""
-    with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
-        response = requests.get(url, verify=False)
-        response.raise_for_status()
-        # Check if the final URL after redirects is on the same domain
-        if not is_same_domain(url, response.url):
-            raise Exception(
-                f"Redirect from {url} to {response.url} goes off-domain, refusing to download source map"
-            )
-        tmp_file.write(response.content)
-        temp_filename = tmp_file.name
+    response = _SESSION.get(url, verify=False, timeout=SOURCEMAP_DOWNLOAD_TIMEOUT)
+    response.raise_for_status()
+    # Check if the final URL after redirects is on the same domain
+    if not is_same_domain(url, response.url):
+        raise Exception(
+            f"Redirect from {url} to {response.url} goes off-domain, refusing to download source map"
+        )
+    # Parse straight from the response body, no need to round-trip via disk
+    return _json_loads(response.content)
 
-    # Load the file as JSON
-    with open(temp_filename, "r", encoding="utf-8") as f:
-        sourcemap_json = json.load(f)
 
-    # Delete the temporary file
-    os.remove(temp_filename)
-    return sourcemap_json
+def iter_sourcemap_sources(fileobj, summary=None):
+    """
+    Stream (source_path, source_content) pairs out of a sourcemap file object.
+
+    The "sources" and "sourcesContent" arrays are siblings, so the paths
+    (small) are buffered and each content string is yielded as soon as it has
+    been parsed, without ever holding the whole sourcemap in memory.
+
+    Args:
+        fileobj: Binary file-like object containing the sourcemap JSON
+        summary (dict, optional): Summary from _new_sourcemap_summary(),
+            filled in from the same event stream for the analysis report
+
+    Yields:
+        tuple: (source_path, source_content) pairs in sourcemap order
+    """
+    if summary is None:
+        summary = _new_sourcemap_summary()
+    sources = summary["sources"]
+    has_content = summary["has_content"]
+    pending_contents = collections.deque()
+    paired = 0
+    content_count = 0
+
+    for prefix, event, value in ijson.parse(fileobj):
+        if prefix == "sources.item" and event in ("string", "null"):
+            sources.append(value)
+            # sourcesContent appeared first, flush what can now be paired
+            while paired < len(sources) and pending_contents:
+                yield sources[paired], pending_contents.popleft()
+                paired += 1
+        elif prefix == "sourcesContent.item" and event in ("string", "null"):
+            if content_count < 5:
+                has_content.append(bool(value))
+            content_count += 1
+            summary["sources_content_count"] = content_count
+            if paired < len(sources):
+                yield sources[paired], value
+                paired += 1
+            else:
+                pending_contents.append(value)
+        elif prefix == "names.item":
+            summary["names_count"] += 1
+        elif prefix == "mappings" and event == "string":
+            summary["mappings_length"] = len(value)
+        elif prefix == "version" and event in ("number", "string"):
+            summary["version"] = value
+        elif prefix == "file" and event == "string":
+            summary["file"] = value
+        elif prefix == "sourceRoot" and event == "string":
+            summary["source_root"] = value
+
+    # Same messages as the parsed-dict path, but only known once the stream
+    # has ended, after the paired entries have already been written
+    if not sources:
+        print("No sources found in sourcemap")
+    if not content_count:
+        print("No source content found in sourcemap!")
+    elif content_count != len(sources):
+        print(
+            f"Warning: Mismatch between sources ({len(sources)}) and sourcesContent ({content_count})"
+        )
+
+
+def stream_sourcemap_sources(url, summary=None):
+    """
+    Stream (source_path, source_content) pairs from a remote sourcemap.
+
+    summary is filled in as the stream is consumed, see
+    iter_sourcemap_sources().
+    """
+    response = _SESSION.get(
+        url, verify=False, stream=True, timeout=SOURCEMAP_DOWNLOAD_TIMEOUT
+    )
+    response.raise_for_status()
+    # Check if the final URL after redirects is on the same domain
+    if not is_same_domain(url, response.url):
+        response.close()
+        raise Exception(
+            f"Redirect from {url} to {response.url} goes off-domain, refusing to download source map"
+        )
+    # Let urllib3 undo any Content-Encoding while ijson reads the raw stream
+    response.raw.decode_content = True
+    return _iter_response_sources(response, summary)
+
+
+def _iter_response_sources(response, summary):
+    with response:
+        yield from iter_sourcemap_sources(response.raw, summary)
 
 
 def load_sourcemap_from_file(file_path):
     """Load sourcemap from local file and return as JSON"""
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            sourcemap_json = json.load(f)
+        with open(file_path, "rb") as f:
+            sourcemap_json = _json_loads(f.read())
         return sourcemap_json
     except FileNotFoundError:
         raise FileNotFoundError(f"Sourcemap file not found: {file_path}")
@@ -511,13 +1044,13 @@ def load_sourcemap_from_file(file_path):
         raise Exception(f"Error reading sourcemap file {file_path}: {e}")
 
 
-def extract_source_files(sourcemap_json, output_dir="extracted_sources"):
-    """Extract all source files from sourcemap into a folder structure"""
-
-    # Create output directory
-    output_path = pathlib.Path(output_dir)
-    output_path.mkdir(exist_ok=True)
+def _sourcemap_source_pairs(sourcemap_json):
+    """
+    Validate a parsed sourcemap and return its (path, content) pairs.
 
+    The pairs consume sourcesContent: each entry is set to None as it is
+    yielded so peak memory shrinks while extraction progresses.
+    """
     # Get sources and sourcesContent from sourcemap
     sources = sourcemap_json.get("sources", [])
     sources_content = sourcemap_json.get("sourcesContent", [])
@@ -527,7 +1060,7 @@ def extract_source_files(sourcemap_json, output_dir="extracted_sources"):
         # The sources could be available directly by request. Attempt to get them from the server directly
         for source in sources:
             try:
-                response = requests.get(source, verify=False)
+                response = _SESSION.get(source, verify=False)
                 response.raise_for_status()
                 # Check if the final URL after redirects is on the same domain
                 if not is_same_domain(source, response.url):
@@ -541,91 +1074,248 @@ def extract_source_files(sourcemap_json, output_dir="extracted_sources"):
 
     if not sources_content:
         print("No source content found in sourcemap!")
-        return
+        return None
 
     # Ensure we have matching arrays
     if len(sources) != len(sources_content):
         print(
             f"Warning: Mismatch between sources ({len(sources)}) and sourcesContent ({len(sources_content)})"
         )
-        return
+        return None
 
     print(f"Found {len(sources)} source files to extract")
+    return _consume_source_pairs(sources, sources_content)
 
-    extracted_files = []
 
-    for i, (source_path, source_content) in enumerate(zip(sources, sources_content)):
-        if source_content is None:
-            print(f"Skipping {source_path} - no content available")
-            continue
+def _consume_source_pairs(sources, sources_content):
+    """Yield (path, content) pairs, clearing each content slot once handed out"""
+    for i, source_path in enumerate(sources):
+        source_content = sources_content[i]
+        # Drop the list's reference so the string is freed once it is written
+        sources_content[i] = None
+        yield source_path, source_content
 
-        # Clean up the source path
-        # Remove webpack:// or other prefixes
-        clean_path = source_path
-        if clean_path.startswith("webpack:///"):
-            clean_path = clean_path[11:]  # Remove "webpack:///"
-        elif clean_path.startswith("webpack://"):
-            clean_path = clean_path[10:]  # Remove "webpack://"
-
-        # Handle absolute paths that might start with /
-        if clean_path.startswith("/"):
-            clean_path = clean_path[1:]
-
-        # Sanitize the path to prevent directory traversal and invalid characters
-        # Split the path and filter out any '..' or '.' components
-        path_parts = clean_path.split("/")
-        sanitized_parts = []
-        for part in path_parts:
-            if part not in ["..", "."] and part.strip():
-                # Remove or replace Windows-invalid characters
-                sanitized_part = part
-                # Replace invalid characters with underscores
-                invalid_chars = '<>:"|?*\\'
-                for char in invalid_chars:
-                    sanitized_part = sanitized_part.replace(char, "_")
-                # Remove any remaining control characters
-                sanitized_part = "".join(
-                    char for char in sanitized_part if ord(char) >= 32
-                )
-                # Ensure the part is not empty after sanitization
-                if sanitized_part.strip():
-                    sanitized_parts.append(sanitized_part)
 
-        # Reconstruct the sanitized path
-        clean_path = "/".join(sanitized_parts)
+def _source_file_path(output_path, prefix_len, messages, index, source_path):
+    """
+    Sanitize a source path into the file it is extracted to below output_path.
 
-        # Create the full file path
-        file_path = output_path / clean_path
+    prefix_len is the length of str(output_path) including the trailing
+    separator, so path lengths are known without building the path string.
+    """
+    # Clean up the source path
+    # Remove webpack:// or other prefixes, then the leading / of absolute paths
+    clean_path = (
+        source_path.removeprefix("webpack:///")
+        .removeprefix("webpack://")
+        .removeprefix("/")
+    )
+
+    # Sanitize the path to prevent directory traversal and invalid characters
+    # PurePosixPath already drops empty and '.' components, '..' and any
+    # leading root are filtered below
+    sanitized_parts = []
+    for part in pathlib.PurePosixPath(clean_path).parts:
+        # Replace Windows-invalid characters with underscores and drop
+        # control characters in a single pass
+        sanitized_part = part.translate(_PATH_PART_TRANSLATION)
+        # Checked after sanitization so e.g. "..\x00" cannot become ".."
+        if (
+            sanitized_part.strip()
+            and sanitized_part not in ("..", ".")
+            and "/" not in sanitized_part
+        ):
+            sanitized_parts.append(sanitized_part)
+
+    clean_path = "/".join(sanitized_parts)
+
+    # Check if path is too long for Windows (260 character limit)
+    if prefix_len + len(clean_path) > 250:  # Leave some buffer
+        messages.append(f"Path too long, using fallback filename for: {clean_path}")
+        return output_path / f"source_{index:04d}.js"
+
+    return output_path.joinpath(*sanitized_parts)
 
-        # Check if path is too long for Windows (260 character limit)
-        if len(str(file_path)) > 250:  # Leave some buffer
-            print(f"Path too long, using fallback filename for: {clean_path}")
-            fallback_filename = f"source_{i:04d}.js"
+
+def _write_source_file(
+    output_path, created_dirs, messages, index, file_path, source_content
+):
+    """
+    Write the content of a single source to file_path.
+
+    Progress lines are appended to messages instead of being printed, as
+    this runs on writer threads whose prints would interleave.
+    """
+    # Ensure the directory exists. Once a directory is created all of its
+    # ancestors exist too, so later files anywhere in that tree skip mkdir
+    try:
+        parent = file_path.parent
+        if parent not in created_dirs:
+            parent.mkdir(parents=True, exist_ok=True)
+            created_dirs.add(parent)
+            created_dirs.update(parent.parents)
+    except OSError as e:
+        messages.append(f"Error creating directory for {file_path}: {e}")
+        # Try to create a sanitized filename as fallback
+        try:
+            # Create a simple filename based on the index
+            fallback_filename = f"source_{index:04d}.js"
             file_path = output_path / fallback_filename
+            messages.append(f"Using fallback filename: {fallback_filename}")
+        except Exception as fallback_error:
+            messages.append(f"Error creating fallback filename: {fallback_error}")
+            return None
 
-        # Ensure the directory exists
+    # Write the source content to file, encoding once and skipping the
+    # buffered text layer of open()
+    try:
+        data = source_content.encode("utf-8")
+        fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
         try:
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-        except OSError as e:
-            print(f"Error creating directory for {file_path}: {e}")
-            # Try to create a sanitized filename as fallback
+            # os.write may write less than asked for, e.g. above ~2GB on Linux
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view) :]
+        finally:
+            os.close(fd)
+        messages.append(f"Extracted: {file_path}")
+        return str(file_path)
+    except Exception as e:
+        messages.append(f"Error writing {file_path}: {e}")
+        return None
+
+
+def _write_source_batch(output_path, created_dirs, batch):
+    """
+    Write a batch of (index, file_path, source_content) entries in order.
+
+    Returns:
+        tuple: Paths of the written files (None for failed entries) and the
+        progress lines to print for the batch
+    """
+    messages = []
+    file_paths = [
+        _write_source_file(
+            output_path, created_dirs, messages, index, file_path, source_content
+        )
+        for index, file_path, source_content in batch
+    ]
+    return file_paths, messages
+
+
+async def extract_source_files(sourcemap, output_dir="extracted_sources"):
+    """
+    Extract all source files from sourcemap into a folder structure.
+
+    Args:
+        sourcemap: Parsed sourcemap dict, or an iterator of
+            (source_path, source_content) pairs as produced by
+            stream_sourcemap_sources(), which are written as they arrive.
+            A dict whose "sources" and "sourcesContent" lengths differ is
+            not extracted at all, while a stream only reports the mismatch
+            once it ends, after its paired entries have been written.
+            A dict is consumed: its "sourcesContent" entries are set to None
+            as they are written, so pass a copy to keep the contents
+        output_dir (str): Directory to extract the sources to
+
+    Returns:
+        list: Paths of the extracted files
+    """
+
+    # Create output directory
+    output_path = pathlib.Path(output_dir)
+    output_path.mkdir(exist_ok=True)
+
+    if isinstance(sourcemap, dict):
+        source_pairs = _sourcemap_source_pairs(sourcemap)
+        if source_pairs is None:
+            return
+    else:
+        source_pairs = sourcemap
+
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(EXTRACT_WRITE_CONCURRENCY)
+    created_dirs = set()
+    # Length of the output directory prefix of every extracted path, computed
+    # the way pathlib joins so e.g. "." (which joins without a prefix) is exact
+    prefix_len = len(str(output_path / "x")) - 1
+    tasks = []
+
+    # File writes release the GIL, so size the pool for I/O rather than CPU
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=EXTRACT_WRITE_THREADS
+    ) as executor:
+
+        # Target file of every write that has not finished yet, to the task
+        # writing it. Sources can sanitize to the same path, e.g. "./src/a.js"
+        # and "src/a.js", so a later write waits for the pending one: no two
+        # threads hold the same file open and the last source still wins
+        pending_writes = {}
+
+        async def write_batch(batch, messages, predecessors):
             try:
-                # Create a simple filename based on the index
-                fallback_filename = f"source_{i:04d}.js"
-                file_path = output_path / fallback_filename
-                print(f"Using fallback filename: {fallback_filename}")
-            except Exception as fallback_error:
-                print(f"Error creating fallback filename: {fallback_error}")
+                if predecessors:
+                    await asyncio.wait(predecessors)
+                file_paths, batch_messages = await loop.run_in_executor(
+                    executor, _write_source_batch, output_path, created_dirs, batch
+                )
+            finally:
+                semaphore.release()
+            messages.extend(batch_messages)
+            # Print from the event loop so lines of concurrent batches stay whole
+            if messages:
+                print("\n".join(messages))
+            return file_paths
+
+        async def submit(batch, messages):
+            await semaphore.acquire()
+            file_paths = {file_path for _, file_path, _ in batch}
+            predecessors = {
+                pending_writes[file_path]
+                for file_path in file_paths
+                if file_path in pending_writes
+            }
+            task = asyncio.create_task(write_batch(batch, messages, predecessors))
+            for file_path in file_paths:
+                pending_writes[file_path] = task
+
+            def forget_writes(task):
+                for file_path in file_paths:
+                    if pending_writes.get(file_path) is task:
+                        del pending_writes[file_path]
+
+            task.add_done_callback(forget_writes)
+            tasks.append(task)
+            await asyncio.sleep(0)
+
+        # Hand files to worker threads in batches so disk writes overlap with
+        # reading the next sources while the per-file thread handoff is paid
+        # only once per batch, keeping at most EXTRACT_WRITE_CONCURRENCY
+        # batches in flight. Target paths are resolved here on the event loop
+        # so writes to the same file can be ordered
+        batch = []
+        messages = []
+        for i, (source_path, source_content) in enumerate(source_pairs):
+            if source_content is None:
+                messages.append(f"Skipping {source_path} - no content available")
                 continue
-
-        # Write the source content to file
-        try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(source_content)
-            extracted_files.append(str(file_path))
-            print(f"Extracted: {file_path}")
-        except Exception as e:
-            print(f"Error writing {file_path}: {e}")
+            file_path = _source_file_path(
+                output_path, prefix_len, messages, i, source_path
+            )
+            batch.append((i, file_path, source_content))
+            if len(batch) == EXTRACT_WRITE_BATCH_SIZE:
+                await submit(batch, messages)
+                batch = []
+                messages = []
+        if batch or messages:
+            await submit(batch, messages)
+
+        extracted_files = [
+            file_path
+            for batch_results in await asyncio.gather(*tasks)
+            for file_path in batch_results
+            if file_path
+        ]
 
     print(
         f"\nExtraction complete! {len(extracted_files)} files extracted to '{output_dir}' directory"
@@ -635,45 +1325,128 @@ def extract_source_files(sourcemap_json, output_dir="extracted_sources"):
 
 def analyze_sourcemap(sourcemap_json):
     """Analyze and display information about the sourcemap"""
-    print("=== Sourcemap Analysis ===")
+    sources_content = sourcemap_json.get("sourcesContent", [])
+    _print_sourcemap_summary(
+        {
+            "version": sourcemap_json.get("version", "unknown"),
+            "file": sourcemap_json.get("file", "unknown"),
+            "source_root": sourcemap_json.get("sourceRoot", ""),
+            "sources": sourcemap_json.get("sources", []),
+            "sources_content_count": len(sources_content),
+            "has_content": [bool(content) for content in sources_content[:5]],
+            "names_count": len(sourcemap_json.get("names", [])),
+            "mappings_length": len(sourcemap_json.get("mappings", "")),
+        }
+    )
 
-    # Basic info
-    version = sourcemap_json.get("version", "unknown")
-    file = sourcemap_json.get("file", "unknown")
-    source_root = sourcemap_json.get("sourceRoot", "")
 
-    print(f"Version: {version}")
-    print(f"File: {file}")
-    print(f"Source Root: {source_root}")
+def _new_sourcemap_summary():
+    """Return an empty summary for iter_sourcemap_sources() to fill in"""
+    return {
+        "version": "unknown",
+        "file": "unknown",
+        "source_root": "",
+        "sources": [],
+        "sources_content_count": 0,
+        "has_content": [],
+        "names_count": 0,
+        "mappings_length": 0,
+    }
+
+
+def _print_sourcemap_summary(summary):
+    """Print the analysis report for a sourcemap summary"""
+    # Collect the report and write it in one go rather than line by line
+    lines = ["=== Sourcemap Analysis ==="]
+
+    # Basic info
+    lines.append(f"Version: {summary['version']}")
+    lines.append(f"File: {summary['file']}")
+    lines.append(f"Source Root: {summary['source_root']}")
 
     # Sources info
-    sources = sourcemap_json.get("sources", [])
-    sources_content = sourcemap_json.get("sourcesContent", [])
+    sources = summary["sources"]
+    has_content = summary["has_content"]
 
-    print(f"Number of sources: {len(sources)}")
-    print(f"Number of source contents: {len(sources_content)}")
+    lines.append(f"Number of sources: {len(sources)}")
+    lines.append(f"Number of source contents: {summary['sources_content_count']}")
 
     # Show first few sources
     if sources:
-        print("\nFirst 5 source files:")
+        lines.append("\nFirst 5 source files:")
         for i, source in enumerate(sources[:5]):
-            has_content = (
-                "✓" if i < len(sources_content) and sources_content[i] else "✗"
-            )
-            print(f"  {has_content} {source}")
+            marker = "✓" if i < len(has_content) and has_content[i] else "✗"
+            lines.append(f"  {marker} {source}")
 
         if len(sources) > 5:
-            print(f"  ... and {len(sources) - 5} more")
+            lines.append(f"  ... and {len(sources) - 5} more")
 
     # Names info
-    names = sourcemap_json.get("names", [])
-    print(f"Number of names: {len(names)}")
+    lines.append(f"Number of names: {summary['names_count']}")
 
     # Mappings info (just length, not content)
-    mappings = sourcemap_json.get("mappings", "")
-    print(f"Mappings length: {len(mappings)} characters")
+    lines.append(f"Mappings length: {summary['mappings_length']} characters")
+
+    lines.append("=" * 30)
+    sys.stdout.write("\n".join(lines) + "\n")
+
 
-    print("=" * 30)
+def init_extraction_worker(log_level):
+    """Prepare a worker process for extract_sourcemap_from_url"""
+    global _SESSION
+
+    setup_logging(log_level)
+    # A forked worker must not share the parent's pooled sockets
+    _SESSION = create_session()
+
+
+def extract_sourcemap_from_url(sourcemap_url, output_dir):
+    """
+    Download a sourcemap and extract its sources into output_dir.
+
+    Runs inside a worker process, so errors are logged rather than raised.
+    """
+    try:
+        if ijson is not None:
+            # Write sources while the sourcemap is still downloading
+            logging.info(f"Streaming sourcemap from: {sourcemap_url}")
+            summary = _new_sourcemap_summary()
+            asyncio.run(
+                extract_source_files(
+                    stream_sourcemap_sources(sourcemap_url, summary), output_dir
+                )
+            )
+
+            # The analysis covers the whole document, so when streaming it
+            # can only be printed once the sourcemap has been read
+            _print_sourcemap_summary(summary)
+        else:
+            logging.info(f"Downloading sourcemap from: {sourcemap_url}")
+            sourcemap_json = download_sourcemap(sourcemap_url)
+
+            # Analyze the sourcemap
+            analyze_sourcemap(sourcemap_json)
+
+            # Extract the source files
+            asyncio.run(extract_source_files(sourcemap_json, output_dir))
+
+    except requests.exceptions.RequestException as e:
+        logging.info(f"Error downloading sourcemap: {e}")
+    except json.JSONDecodeError as e:
+        logging.info(f"Error parsing sourcemap JSON: {e}")
+    except Exception as e:
+        logging.error(f"Unexpected error: {e}")
+
+
+def extract_sourcemaps_from_urls(sourcemap_urls, output_dir):
+    """
+    Extract sourcemaps sharing output_dir one after another, in order.
+
+    Runs inside a worker process, so later sourcemaps overwrite the files
+    they have in common with earlier ones without racing them.
+    """
+    for sourcemap_url in sourcemap_urls:
+        extract_sourcemap_from_url(sourcemap_url, output_dir)
 
 
 def main():
@@ -728,6 +1501,12 @@ def main():
         "-o",
         help="Output directory where files will be extracted to",
     )
+    extract_sources_group.add_argument(
+        "--force",
+        "-f",
+        action="store_true",
+        help="Delete existing contents of output directories without asking",
+    )
 
     args = parser.parse_args()
 
@@ -775,11 +1554,11 @@ def main():
 
             if args.extract_sources:
                 # Check and clean output directory if needed
-                if not check_and_clean_output_directory(output_dir):
+                if not check_and_clean_output_directory(output_dir, args.force):
                     return
 
                 # Extract the source files
-                extract_source_files(sourcemap_json, output_dir)
+                asyncio.run(extract_source_files(sourcemap_json, output_dir))
 
         except Exception as e:
             logging.error(f"Error processing sourcemap file: {e}")
@@ -794,20 +1573,19 @@ def main():
 
         logging.info(f"Checking {url} for script tags...")
         # Get script tags from head
-        scripts = get_script_tags(url, proxy)
+        script_urls = get_script_tags(url, proxy)
 
-        if not scripts:
+        if not script_urls:
             logging.info("No script tags with src attributes from this domain found")
             return
 
-        logging.info(f"Found {len(scripts)} script tag(s):")
-        for i, script in enumerate(scripts, 1):
-            logging.info(f"{script['src']}")
+        logging.info(f"Found {len(script_urls)} script tag(s):")
+        for script_url in script_urls:
+            logging.info(f"{script_url}")
 
         logging.info("Checking for source map files...")
 
         # Check for source maps using async
-        script_urls = [script["src"] for script in scripts]
         sourcemap_results = asyncio.run(check_for_sourcemaps(script_urls, proxy))
 
         # Summary
@@ -815,15 +1593,22 @@ def main():
         total_sourcemaps = sum(
             len(sourcemaps) for sourcemaps in sourcemap_results.values()
         )
-        logging.info(f"Scripts checked: {len(scripts)}")
+        logging.info(f"Scripts checked: {len(script_urls)}")
         logging.info(f"Source maps found: {total_sourcemaps}")
 
         sourcemap_json_array = []
+        # Output directory to the sourcemaps extracted into it, in order
+        extraction_jobs = {}
+        # Scripts can share a sourcemap, list and extract each one only once
+        seen_urls = set()
         if total_sourcemaps > 0:
             logging.info("All source maps found:")
             for script_url, sourcemaps in sourcemap_results.items():
                 if sourcemaps:
                     for sourcemap in sourcemaps:
+                        if sourcemap["url"] in seen_urls:
+                            continue
+                        seen_urls.add(sourcemap["url"])
                         if args.json:
                             sourcemap_json_array.append(sourcemap)
                         else:
@@ -836,30 +1621,48 @@ def main():
                                 output_dir = f"{args.output_dir}/{hostname}/{url_parsed.path.split('/')[-1]}"
                                 # Replace .. with . in output_dir
                                 output_dir = output_dir.replace("..", ".")
+                                # Scripts with the same file name on different
+                                # paths share a directory, extract those maps
+                                # one after another into it
+                                if output_dir in extraction_jobs:
+                                    logging.warning(
+                                        f"{sourcemap['url']} shares the output directory {output_dir} with another sourcemap, extracting it after the earlier one"
+                                    )
+                                    extraction_jobs[output_dir].append(sourcemap["url"])
+                                    continue
                                 # Check and clean output directory if needed
-                                if not check_and_clean_output_directory(output_dir):
+                                if not check_and_clean_output_directory(
+                                    output_dir, args.force
+                                ):
                                     continue
                                 # Check if output_dir is a valid directory with netloc inside it , otherwise create it
                                 if not os.path.exists(output_dir):
                                     os.makedirs(output_dir)
 
-                                logging.info(
-                                    f"Downloading sourcemap from: {sourcemap['url']}"
-                                )
-                                sourcemap_json = download_sourcemap(sourcemap["url"])
-
-                                # Analyze the sourcemap
-                                analyze_sourcemap(sourcemap_json)
-
-                                # Extract the source files
-                                extract_source_files(sourcemap_json, output_dir)
-
-                            except requests.exceptions.RequestException as e:
-                                logging.info(f"Error downloading sourcemap: {e}")
-                            except json.JSONDecodeError as e:
-                                logging.info(f"Error parsing sourcemap JSON: {e}")
+                                extraction_jobs[output_dir] = [sourcemap["url"]]
                             except Exception as e:
                                 logging.error(f"Unexpected error: {e}")
+
+        if extraction_jobs:
+            # Sourcemaps in different directories are independent, so
+            # download, parse and write them in parallel worker processes
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=min(len(extraction_jobs), os.cpu_count() or 1),
+                initializer=init_extraction_worker,
+                initargs=(args.log_level,),
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        extract_sourcemaps_from_urls, sourcemap_urls, job_dir
+                    )
+                    for job_dir, sourcemap_urls in extraction_jobs.items()
+                ]
+                for future in concurrent.futures.as_completed(futures):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logging.error(f"Unexpected error: {e}")
+
         if args.json and len(sourcemap_json_array) > 0:
             print(json.dumps(sourcemap_json_array, indent=4))
 